@@ -7,19 +7,30 @@ for each location.
 """
 
 import csv
-import subprocess
+import os
 import sys
+import urllib.request
 import xml.etree.ElementTree as ET
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime
 from io import BytesIO
-from typing import Iterator
+from typing import BinaryIO, Iterator, TextIO
 
 
 BOM_URL = "ftp://ftp.bom.gov.au/anon/gen/fwo/IDN11060.xml"
 
+CSV_HEADER = (
+    "aac",
+    "location",
+    "min_temp_celsius",
+    "min_temp_date",
+    "max_temp_celsius",
+    "max_temp_date",
+)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class LocationForecast:
     """Forecast data for a single location."""
     aac: str
@@ -30,14 +41,14 @@ class LocationForecast:
     max_temp_date: str | None
 
 
-def fetch_xml_data(url: str = BOM_URL) -> bytes:
-    """Fetch XML data from BOM FTP server using curl."""
-    result = subprocess.run(
-        ["curl", "-s", url],
-        capture_output=True,
-        check=True,
-    )
-    return result.stdout
+def stream_xml_data(url: str = BOM_URL) -> BinaryIO:
+    """
+    Open a streaming download of XML data from BOM FTP server.
+
+    The returned response can be parsed while it downloads, and should be
+    used as a context manager so the connection is closed afterwards.
+    """
+    return urllib.request.urlopen(url, timeout=60)
 
 
 def parse_forecast_period(period_elem: ET.Element) -> tuple[str | None, int | None, int | None]:
@@ -70,18 +81,27 @@ def parse_forecast_period(period_elem: ET.Element) -> tuple[str | None, int | No
     return start_date, min_temp, max_temp
 
 
-def parse_bom_xml(xml_data: bytes) -> Iterator[LocationForecast]:
+def parse_bom_xml(source: bytes | BinaryIO) -> Iterator[LocationForecast]:
     """
     Stream parse BOM XML and yield location forecasts.
 
+    The source can be raw XML bytes or a binary file-like object (such as a
+    download stream), which is parsed incrementally as it is read.
+
     For each location, finds the nearest (lowest index) forecast period
     containing min and max temperatures.
     """
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+
     # Use iterparse for streaming - we process area elements one at a time
-    context = ET.iterparse(BytesIO(xml_data), events=("end",))
+    context = ET.iterparse(source, events=("end",))
+
+    for _event, elem in context:
+        if elem.tag != "area":
+            continue
 
-    for event, elem in context:
-        if elem.tag == "area" and elem.get("type") == "location":
+        if elem.get("type") == "location":
             aac = elem.get("aac", "")
             description = elem.get("description", "")
 
@@ -118,49 +138,54 @@ def parse_bom_xml(xml_data: bytes) -> Iterator[LocationForecast]:
                 max_temp_date=nearest_max_date,
             )
 
-            # Clear the element to free memory
-            elem.clear()
+        # Free memory for the processed area
+        elem.clear()
 
 
-def write_csv(forecasts: Iterator[LocationForecast], output_path: str) -> int:
-    """Write forecasts to CSV file. Returns number of rows written."""
-    count = 0
-    with open(output_path, "w", newline="") as f:
+def _csv_value(value: object) -> object:
+    """Convert a missing (None) value to an empty CSV cell."""
+    return "" if value is None else value
+
+
+def write_csv(forecasts: Iterator[LocationForecast], output: str | os.PathLike | TextIO) -> int:
+    """
+    Write forecasts to CSV. Returns number of rows written.
+
+    The output can be a file path or an already open text file.
+    """
+    rows = [
+        [
+            forecast.aac,
+            forecast.description,
+            _csv_value(forecast.min_temp),
+            _csv_value(forecast.min_temp_date),
+            _csv_value(forecast.max_temp),
+            _csv_value(forecast.max_temp_date),
+        ]
+        for forecast in forecasts
+    ]
+
+    if hasattr(output, "write"):
+        output_file = nullcontext(output)
+    else:
+        output_file = open(output, "w", newline="")
+
+    with output_file as f:
         writer = csv.writer(f)
-        writer.writerow([
-            "aac",
-            "location",
-            "min_temp_celsius",
-            "min_temp_date",
-            "max_temp_celsius",
-            "max_temp_date",
-        ])
-
-        for forecast in forecasts:
-            writer.writerow([
-                forecast.aac,
-                forecast.description,
-                forecast.min_temp if forecast.min_temp is not None else "",
-                forecast.min_temp_date or "",
-                forecast.max_temp if forecast.max_temp is not None else "",
-                forecast.max_temp_date or "",
-            ])
-            count += 1
-
-    return count
+        writer.writerow(CSV_HEADER)
+        writer.writerows(rows)
+
+    return len(rows)
 
 
 def main() -> int:
     """Main entry point."""
     output_path = "site/forecast.csv"
 
-    print(f"Fetching data from {BOM_URL}...")
-    xml_data = fetch_xml_data()
-    print(f"Downloaded {len(xml_data):,} bytes")
-
-    print(f"Parsing XML and writing to {output_path}...")
-    forecasts = parse_bom_xml(xml_data)
-    count = write_csv(forecasts, output_path)
+    print(f"Streaming data from {BOM_URL} and writing to {output_path}...")
+    with stream_xml_data() as stream:
+        forecasts = parse_bom_xml(stream)
+        count = write_csv(forecasts, output_path)
 
     print(f"Done! Wrote {count} locations to {output_path}")
     return 0
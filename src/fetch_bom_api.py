@@ -10,13 +10,22 @@ Uses the BOM API to get:
 """
 
 import csv
+import gzip
+import http.client
 import json
+import os
 import sys
+import threading
+import time
+import urllib.parse
 import urllib.request
 import urllib.error
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Iterator
+from typing import Iterable, Iterator, TextIO
 
 
 BOM_API_BASE = "https://api.weather.bom.gov.au/v1"
@@ -24,15 +33,32 @@ BOM_API_BASE = "https://api.weather.bom.gov.au/v1"
 # Number of forecast days (today + 6 more days)
 FORECAST_DAYS = 7
 
+# CSV columns: location, today, days 1-6, rain, fire
+CSV_HEADER = (
+    "location",
+    "today_min",
+    "today_max",
+    *(f"day{i}_{k}" for i in range(1, FORECAST_DAYS) for k in ("min", "max")),
+    "rain_mm",
+    "fire_danger",
+)
 
-@dataclass
+# Number of locations fetched concurrently (each fetch is mostly waiting on HTTP)
+MAX_WORKERS = 16
+
+# Location search results are cached on disk, since they almost never change
+LOCATION_CACHE_PATH = ".cache/locations.json"
+LOCATION_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+
+
+@dataclass(slots=True, frozen=True)
 class DayForecast:
     """Forecast for a single day."""
     temp_min: int | None
     temp_max: int | None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LocationForecast:
     """Full forecast data for a location."""
     name: str
@@ -42,21 +68,84 @@ class LocationForecast:
     today_max: int | None
 
     # Following days forecast (days 1-6, not including today)
-    daily_forecasts: list[DayForecast] = field(default_factory=list)
+    daily_forecasts: tuple[DayForecast, ...] = ()
 
     # Rain and fire (today)
     rain_range_mm: str = ""
     fire_danger: str | None = None
 
 
+REQUEST_HEADERS = {
+    "User-Agent": "bom-forecast/1.0",
+    # Forecast JSON is mostly repeated keys, so it compresses well
+    "Accept-Encoding": "gzip",
+}
+
+# Statuses whose Location header fetch_json follows
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+
+# Per-thread keep-alive connections, keyed by host
+_thread_local = threading.local()
+
+
+def _get_connection(host: str) -> http.client.HTTPSConnection:
+    """Get this thread's persistent connection to a host, creating it if needed."""
+    connections = getattr(_thread_local, "connections", None)
+    if connections is None:
+        connections = _thread_local.connections = {}
+
+    connection = connections.get(host)
+    if connection is None:
+        connection = connections[host] = http.client.HTTPSConnection(host, timeout=30)
+    return connection
+
+
+def _get(url: str) -> tuple[http.client.HTTPResponse, bytes]:
+    """Send a GET over this thread's connection, returning the response and body."""
+    parts = urllib.parse.urlsplit(url)
+    path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+    connection = _get_connection(parts.netloc)
+
+    # Retry once, in case the server closed an idle keep-alive connection
+    for attempt in range(2):
+        try:
+            connection.request("GET", path, headers=REQUEST_HEADERS)
+            response = connection.getresponse()
+            return response, response.read()
+        except ConnectionError as e:
+            connection.close()
+            if attempt:
+                raise urllib.error.URLError(e) from e
+        except (OSError, http.client.HTTPException) as e:
+            connection.close()
+            raise urllib.error.URLError(e) from e
+
+
 def fetch_json(url: str) -> dict:
-    """Fetch JSON from a URL."""
-    request = urllib.request.Request(
-        url,
-        headers={"User-Agent": "bom-forecast/1.0"}
-    )
-    with urllib.request.urlopen(request, timeout=30) as response:
-        return json.loads(response.read().decode("utf-8"))
+    """
+    Fetch JSON from a URL.
+
+    Connections are kept alive and reused, so repeated requests to the API
+    only pay for the TCP/TLS handshake once per thread. Responses are
+    requested gzip-compressed. Unlike urlopen, at most one redirect is
+    followed and proxy settings (HTTPS_PROXY) are not used.
+    Network errors are raised as urllib.error.URLError.
+    """
+    response, body = _get(url)
+
+    location = response.getheader("Location")
+    if response.status in REDIRECT_STATUSES and location:
+        url = urllib.parse.urljoin(url, location)
+        response, body = _get(url)
+
+    if response.status != 200:
+        raise urllib.error.HTTPError(url, response.status, response.reason, response.headers, None)
+
+    if response.getheader("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+
+    # json.loads accepts bytes and detects the UTF-8 encoding itself
+    return json.loads(body)
 
 
 def search_location(name: str) -> dict | None:
@@ -78,16 +167,22 @@ def search_location(name: str) -> dict | None:
         if not locations:
             return None
 
-        # Try to find an exact match in NSW first (case-insensitive)
+        # Try to find an exact match in NSW first (case-insensitive),
+        # remembering the first exact match elsewhere as a fallback. The
+        # plain == catches the usual same-case match without lowercasing.
         name_lower = name.lower()
+        exact_match = None
         for loc in locations:
-            if loc.get("name", "").lower() == name_lower and loc.get("state") == "NSW":
-                return loc
+            loc_name = loc.get("name", "")
+            if loc_name == name or loc_name.lower() == name_lower:
+                if loc.get("state") == "NSW":
+                    return loc
+                if exact_match is None:
+                    exact_match = loc
 
         # Fall back to any exact match
-        for loc in locations:
-            if loc.get("name", "").lower() == name_lower:
-                return loc
+        if exact_match is not None:
+            return exact_match
 
         # Fall back to first NSW result
         for loc in locations:
@@ -140,8 +235,8 @@ def parse_forecast(location: dict, forecast_data: list[dict]) -> LocationForecas
             today_max = now_data.get("temp_later", today_max)
 
     # Rainfall - use lower_range and upper_range, format as "min-max"
-    rain_data = today.get("rain", {})
-    rain_amount = rain_data.get("amount", {})
+    # (rain and amount can be missing or null)
+    rain_amount = (today.get("rain") or {}).get("amount") or {}
     rain_lower = rain_amount.get("lower_range")
     rain_upper = rain_amount.get("upper_range")
 
@@ -153,16 +248,16 @@ def parse_forecast(location: dict, forecast_data: list[dict]) -> LocationForecas
     else:
         rain_range = ""
 
-    # Fire danger
+    # Fire danger - one of a handful of ratings, so share a single string per rating
     fire_danger = today.get("fire_danger")
+    if isinstance(fire_danger, str):
+        fire_danger = sys.intern(fire_danger)
 
     # Following days forecast (skip today, take next 6 days)
-    daily_forecasts = []
-    for day in forecast_data[1:FORECAST_DAYS]:
-        daily_forecasts.append(DayForecast(
-            temp_min=day.get("temp_min"),
-            temp_max=day.get("temp_max"),
-        ))
+    daily_forecasts = tuple([
+        DayForecast(temp_min=day.get("temp_min"), temp_max=day.get("temp_max"))
+        for day in forecast_data[1:FORECAST_DAYS]
+    ])
 
     return LocationForecast(
         name=location.get("name", ""),
@@ -174,80 +269,182 @@ def parse_forecast(location: dict, forecast_data: list[dict]) -> LocationForecas
     )
 
 
-def read_locations(path: str) -> list[str]:
-    """Read location names from a file, one per line."""
-    with open(path) as f:
-        return [line.strip() for line in f if line.strip()]
+def iter_locations(path: str) -> Iterator[str]:
+    """Lazily yield location names from a file, one per line."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if name := line.strip():
+                yield name
 
 
-def fetch_forecasts(location_names: list[str]) -> Iterator[LocationForecast]:
-    """Fetch forecasts for a list of location names."""
-    for name in location_names:
-        print(f"Fetching {name}...", file=sys.stderr)
+def read_locations(path: str) -> list[str]:
+    """Read location names from a file, one per line."""
+    return list(iter_locations(path))
 
-        location = search_location(name)
-        if not location:
-            print(f"  Warning: Location '{name}' not found", file=sys.stderr)
-            continue
 
-        geohash = location.get("geohash")
-        if not geohash:
-            print(f"  Warning: No geohash for '{name}'", file=sys.stderr)
-            continue
+def load_location_cache(path: str = LOCATION_CACHE_PATH) -> dict[str, dict]:
+    """
+    Load cached location search results, keyed by lowercased search name.
 
-        forecast_data = fetch_daily_forecast(geohash)
-        if not forecast_data:
-            print(f"  Warning: No forecast data for '{name}'", file=sys.stderr)
-            continue
+    Entries older than LOCATION_CACHE_TTL_SECONDS are dropped, as are
+    malformed entries. A missing or unreadable cache file gives an empty
+    cache.
+    """
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(cache, dict):
+        return {}
+
+    now = time.time()
+    return {
+        key: entry for key, entry in cache.items()
+        if isinstance(entry, dict)
+        and isinstance(entry.get("cached_at"), (int, float))
+        and now - entry["cached_at"] < LOCATION_CACHE_TTL_SECONDS
+    }
+
+
+def save_location_cache(cache: dict[str, dict], path: str = LOCATION_CACHE_PATH) -> None:
+    """Save location search results to the cache file."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+
+def _lookup_location(name: str, location_cache: dict[str, dict]) -> dict | None:
+    """Look up a location in the cache, falling back to an API search."""
+    key = name.lower()
+    location = location_cache.get(key)
+    if location is not None:
+        return location
+
+    location = search_location(name)
+    if location and location.get("geohash"):
+        location_cache[key] = {
+            "name": location.get("name", ""),
+            "geohash": location["geohash"],
+            "state": location.get("state"),
+            "postcode": location.get("postcode"),
+            "cached_at": time.time(),
+        }
+    return location
+
+
+def _fetch_one(entry: str, location_cache: dict[str, dict]) -> LocationForecast | None:
+    """
+    Fetch and parse the forecast for a single locations file entry.
 
-        yield parse_forecast(location, forecast_data)
+    An entry is a location name, optionally followed by "|<geohash>"
+    (e.g. "Lithgow|r64c839") to skip the location search entirely.
+    """
+    name, _, geohash = entry.partition("|")
+    name = name.strip()
+    geohash = geohash.strip()
 
+    print(f"Fetching {name}...", file=sys.stderr)
 
-def write_csv(forecasts: Iterator[LocationForecast], output_path: str) -> int:
-    """Write forecasts to CSV. Returns number of rows written."""
-    count = 0
+    if geohash:
+        location = {"name": name, "geohash": geohash}
+    else:
+        location = _lookup_location(name, location_cache)
+    if not location:
+        print(f"  Warning: Location '{name}' not found", file=sys.stderr)
+        return None
 
-    with open(output_path, "w", newline="") as f:
-        writer = csv.writer(f)
+    geohash = location.get("geohash")
+    if not geohash:
+        print(f"  Warning: No geohash for '{name}'", file=sys.stderr)
+        return None
 
-        # Header: location, today, days 1-6, rain, fire
-        header = ["location", "today_min", "today_max"]
+    forecast_data = fetch_daily_forecast(geohash)
+    if not forecast_data:
+        print(f"  Warning: No forecast data for '{name}'", file=sys.stderr)
+        return None
 
-        # Days 1-6 (following days)
-        for i in range(1, FORECAST_DAYS):
-            header.extend([f"day{i}_min", f"day{i}_max"])
+    return parse_forecast(location, forecast_data)
 
-        header.extend(["rain_mm", "fire_danger"])
 
-        writer.writerow(header)
+def fetch_forecasts(
+    location_names: Iterable[str],
+    location_cache: dict[str, dict] | None = None,
+    max_workers: int = MAX_WORKERS,
+) -> Iterator[LocationForecast]:
+    """
+    Fetch forecasts for an iterable of location names (e.g. iter_locations).
 
-        for forecast in forecasts:
-            row = [
-                forecast.name,
-                forecast.today_min if forecast.today_min is not None else "",
-                forecast.today_max if forecast.today_max is not None else "",
-            ]
+    Up to max_workers locations are fetched concurrently, but results are
+    yielded in the same order as the input names. A name listed more than
+    once is only fetched once. Locations found in location_cache skip the
+    search API call, and new search results are added to it.
+    """
+    if location_cache is None:
+        location_cache = {}
+
+    fetch_one = partial(_fetch_one, location_cache=location_cache)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Submit as names are read, so fetching overlaps reading the input
+        names = []
+        futures = {}
+        for name in location_names:
+            names.append(name)
+            if name not in futures:
+                futures[name] = executor.submit(fetch_one, name)
+
+        for name in names:
+            forecast = futures[name].result()
+            if forecast is not None:
+                yield forecast
+
+
+def _csv_value(value: object) -> object:
+    """Convert a missing (None) value to an empty CSV cell."""
+    return "" if value is None else value
+
+
+def _csv_row(forecast: LocationForecast) -> list:
+    """Build the CSV row for a forecast, in CSV_HEADER column order."""
+    row = [
+        forecast.name,
+        _csv_value(forecast.today_min),
+        _csv_value(forecast.today_max),
+    ]
+
+    # Add days 1-6, padding any missing days with empty cells
+    days = forecast.daily_forecasts[:FORECAST_DAYS - 1]
+    for day in days:
+        row.extend([_csv_value(day.temp_min), _csv_value(day.temp_max)])
+    row.extend(["", ""] * (FORECAST_DAYS - 1 - len(days)))
+
+    row.extend([
+        forecast.rain_range_mm,
+        _csv_value(forecast.fire_danger),
+    ])
+    return row
+
+
+def write_csv(forecasts: Iterator[LocationForecast], output: str | os.PathLike | TextIO) -> int:
+    """
+    Write forecasts to CSV. Returns number of rows written.
 
-            # Add days 1-6
-            for i in range(FORECAST_DAYS - 1):
-                if i < len(forecast.daily_forecasts):
-                    day = forecast.daily_forecasts[i]
-                    row.extend([
-                        day.temp_min if day.temp_min is not None else "",
-                        day.temp_max if day.temp_max is not None else "",
-                    ])
-                else:
-                    row.extend(["", ""])
+    The output can be a file path or an already open text file.
+    """
+    rows = list(map(_csv_row, forecasts))
 
-            row.extend([
-                forecast.rain_range_mm,
-                forecast.fire_danger or "",
-            ])
+    if hasattr(output, "write"):
+        output_file = nullcontext(output)
+    else:
+        output_file = open(output, "w", newline="")
 
-            writer.writerow(row)
-            count += 1
+    with output_file as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        writer.writerows(rows)
 
-    return count
+    return len(rows)
 
 
 def main() -> int:
@@ -259,13 +456,14 @@ def main() -> int:
         print(f"Error: {locations_file} not found", file=sys.stderr)
         return 1
 
-    print(f"Reading locations from {locations_file}...", file=sys.stderr)
-    location_names = read_locations(locations_file)
-    print(f"Found {len(location_names)} locations", file=sys.stderr)
+    location_cache = load_location_cache()
+    print(f"Loaded {len(location_cache)} cached locations", file=sys.stderr)
 
-    print(f"Fetching forecasts...", file=sys.stderr)
-    forecasts = fetch_forecasts(location_names)
+    # Names are read lazily, so fetching starts while the file is still being read
+    print(f"Fetching forecasts for locations in {locations_file}...", file=sys.stderr)
+    forecasts = fetch_forecasts(iter_locations(locations_file), location_cache)
     count = write_csv(forecasts, output_path)
+    save_location_cache(location_cache)
 
     print(f"Done! Wrote {count} locations to {output_path}", file=sys.stderr)
     return 0
@@ -1,11 +1,10 @@
 """Tests for BOM forecast fetching and parsing."""
 
 import csv
-import tempfile
+from io import BytesIO, StringIO
 from pathlib import Path
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import pytest
 
 from fetch_bom import (
     LocationForecast,
@@ -75,6 +74,16 @@ MISSING_DATA_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
 """
 
 
+@pytest.fixture(scope="module")
+def minimal_forecasts():
+    return list(parse_bom_xml(MINIMAL_XML))
+
+
+@pytest.fixture(scope="module")
+def multi_forecasts():
+    return list(parse_bom_xml(MULTI_LOCATION_XML))
+
+
 class TestParseForecastPeriod:
     """Tests for parse_forecast_period function."""
 
@@ -133,8 +142,8 @@ class TestParseForecastPeriod:
 class TestParseBomXml:
     """Tests for parse_bom_xml function."""
 
-    def test_parses_single_location(self):
-        forecasts = list(parse_bom_xml(MINIMAL_XML))
+    def test_parses_single_location(self, minimal_forecasts):
+        forecasts = minimal_forecasts
 
         assert len(forecasts) == 1
         assert forecasts[0].aac == "NSW_PT131"
@@ -144,8 +153,8 @@ class TestParseBomXml:
         assert forecasts[0].min_temp == 21
         assert forecasts[0].min_temp_date == "2026-01-09"
 
-    def test_parses_multiple_locations(self):
-        forecasts = list(parse_bom_xml(MULTI_LOCATION_XML))
+    def test_parses_multiple_locations(self, multi_forecasts):
+        forecasts = multi_forecasts
 
         assert len(forecasts) == 2
 
@@ -159,10 +168,9 @@ class TestParseBomXml:
         assert liverpool.max_temp == 39
         assert liverpool.min_temp == 19
 
-    def test_ignores_non_location_areas(self):
+    def test_ignores_non_location_areas(self, multi_forecasts):
         # The MULTI_LOCATION_XML has a "region" type area that should be ignored
-        forecasts = list(parse_bom_xml(MULTI_LOCATION_XML))
-        descriptions = [f.description for f in forecasts]
+        descriptions = [f.description for f in multi_forecasts]
 
         assert "New South Wales" not in descriptions
 
@@ -174,12 +182,15 @@ class TestParseBomXml:
         assert forecasts[0].min_temp is None
         assert forecasts[0].max_temp is None
 
-    def test_takes_nearest_temps(self):
+    def test_parses_from_file_like_stream(self):
+        forecasts = list(parse_bom_xml(BytesIO(MULTI_LOCATION_XML)))
+
+        assert [f.description for f in forecasts] == ["Sydney", "Liverpool"]
+
+    def test_takes_nearest_temps(self, minimal_forecasts):
         # Sydney has max in index 0 (33) and min in index 1 (21)
         # Should take nearest (first available) for each
-        forecasts = list(parse_bom_xml(MINIMAL_XML))
-
-        sydney = forecasts[0]
+        sydney = minimal_forecasts[0]
         # Max from index 0
         assert sydney.max_temp == 33
         assert sydney.max_temp_date == "2026-01-08"
@@ -191,7 +202,7 @@ class TestParseBomXml:
 class TestWriteCsv:
     """Tests for write_csv function."""
 
-    def test_writes_csv_with_header(self):
+    def test_writes_csv_with_header(self, tmp_path):
         forecasts = [
             LocationForecast(
                 aac="TEST001",
@@ -203,37 +214,31 @@ class TestWriteCsv:
             )
         ]
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            output_path = f.name
-
-        try:
-            count = write_csv(iter(forecasts), output_path)
-
-            assert count == 1
-
-            with open(output_path) as f:
-                reader = csv.reader(f)
-                rows = list(reader)
-
-            assert len(rows) == 2  # header + 1 data row
-            assert rows[0] == [
-                "aac",
-                "location",
-                "min_temp_celsius",
-                "min_temp_date",
-                "max_temp_celsius",
-                "max_temp_date",
-            ]
-            assert rows[1] == [
-                "TEST001",
-                "Test Location",
-                "15",
-                "2026-01-09",
-                "25",
-                "2026-01-08",
-            ]
-        finally:
-            Path(output_path).unlink()
+        output_path = tmp_path / "forecast.csv"
+        count = write_csv(iter(forecasts), output_path)
+
+        assert count == 1
+
+        with open(output_path) as f:
+            rows = list(csv.reader(f))
+
+        assert len(rows) == 2  # header + 1 data row
+        assert rows[0] == [
+            "aac",
+            "location",
+            "min_temp_celsius",
+            "min_temp_date",
+            "max_temp_celsius",
+            "max_temp_date",
+        ]
+        assert rows[1] == [
+            "TEST001",
+            "Test Location",
+            "15",
+            "2026-01-09",
+            "25",
+            "2026-01-08",
+        ]
 
     def test_handles_missing_values(self):
         forecasts = [
@@ -247,21 +252,14 @@ class TestWriteCsv:
             )
         ]
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            output_path = f.name
-
-        try:
-            write_csv(iter(forecasts), output_path)
+        buf = StringIO()
+        write_csv(iter(forecasts), buf)
+        buf.seek(0)
+        rows = list(csv.reader(buf))
 
-            with open(output_path) as f:
-                reader = csv.reader(f)
-                rows = list(reader)
-
-            # Missing values should be empty strings
-            assert rows[1][2] == ""  # min_temp_celsius
-            assert rows[1][3] == ""  # min_temp_date
-        finally:
-            Path(output_path).unlink()
+        # Missing values should be empty strings
+        assert rows[1][2] == ""  # min_temp_celsius
+        assert rows[1][3] == ""  # min_temp_date
 
 
 class TestIntegration:
@@ -272,10 +270,9 @@ class TestIntegration:
         if not sample_path.exists():
             return  # Skip if sample not available
 
+        # Stream straight from the file rather than reading it into memory
         with open(sample_path, "rb") as f:
-            xml_data = f.read()
-
-        forecasts = list(parse_bom_xml(xml_data))
+            forecasts = list(parse_bom_xml(f))
 
         # Should have many locations
         assert len(forecasts) > 100
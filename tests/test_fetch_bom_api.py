@@ -1,14 +1,19 @@
 """Tests for BOM API forecast fetching."""
 
 import csv
-import tempfile
-from pathlib import Path
-from unittest.mock import patch
+import gzip
+import json
+import threading
+import time
+import urllib.error
+from io import StringIO
+from types import MappingProxyType
+from unittest.mock import MagicMock, patch
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import pytest
 
 from fetch_bom_api import (
+    CSV_HEADER,
     DayForecast,
     LocationForecast,
     parse_forecast,
@@ -16,11 +21,18 @@ from fetch_bom_api import (
     write_csv,
     search_location,
     fetch_daily_forecast,
+    fetch_forecasts,
+    fetch_json,
+    iter_locations,
+    load_location_cache,
+    save_location_cache,
+    _csv_row,
 )
 
 
-# Sample API responses
-SEARCH_RESPONSE = {
+# Sample API responses. MappingProxyType stops their top-level keys being
+# reassigned; it is shallow, so nested lists and dicts are still mutable.
+SEARCH_RESPONSE = MappingProxyType({
     "metadata": {"response_timestamp": "2026-01-17T00:00:00Z"},
     "data": [
         {
@@ -31,9 +43,9 @@ SEARCH_RESPONSE = {
             "state": "NSW"
         }
     ]
-}
+})
 
-SEARCH_RESPONSE_MULTIPLE = {
+SEARCH_RESPONSE_MULTIPLE = MappingProxyType({
     "metadata": {"response_timestamp": "2026-01-17T00:00:00Z"},
     "data": [
         {
@@ -51,9 +63,9 @@ SEARCH_RESPONSE_MULTIPLE = {
             "state": "NSW"
         }
     ]
-}
+})
 
-FORECAST_RESPONSE = {
+FORECAST_RESPONSE = MappingProxyType({
     "data": [
         {
             "date": "2026-01-16T13:00:00Z",
@@ -100,15 +112,28 @@ FORECAST_RESPONSE = {
         }
     ],
     "metadata": {"response_timestamp": "2026-01-17T00:00:00Z"}
-}
+})
 
-LOCATION_DATA = {
+LOCATION_DATA = MappingProxyType({
     "geohash": "r64c839",
     "id": "Lithgow-r64c839",
     "name": "Lithgow",
     "postcode": "2790",
     "state": "NSW"
-}
+})
+
+
+@pytest.fixture(scope="session")
+def _fetch_json_mock():
+    return MagicMock()
+
+
+@pytest.fixture
+def mock_fetch(_fetch_json_mock, monkeypatch):
+    """Replace fetch_json with a shared mock, reset for each test."""
+    _fetch_json_mock.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr("fetch_bom_api.fetch_json", _fetch_json_mock)
+    return _fetch_json_mock
 
 
 class TestParseForecast:
@@ -126,6 +151,12 @@ class TestParseForecast:
 
         assert forecast.fire_danger == "Moderate"
 
+    def test_fire_danger_strings_are_shared(self):
+        first = parse_forecast(LOCATION_DATA, json.loads(json.dumps(FORECAST_RESPONSE["data"])))
+        second = parse_forecast(LOCATION_DATA, json.loads(json.dumps(FORECAST_RESPONSE["data"])))
+
+        assert first.fire_danger is second.fire_danger
+
     def test_parses_rainfall_as_range_string(self):
         forecast = parse_forecast(LOCATION_DATA, FORECAST_RESPONSE["data"])
 
@@ -175,6 +206,12 @@ class TestParseForecast:
 
         assert forecast.rain_range_mm == ""
 
+    def test_handles_null_rain_data(self):
+        data = [{"date": "2026-01-16T13:00:00Z", "temp_max": 25, "rain": None}]
+        forecast = parse_forecast(LOCATION_DATA, data)
+
+        assert forecast.rain_range_mm == ""
+
     def test_handles_night_now_data(self):
         """When it's night, now_label is 'Min' and temp order is reversed."""
         night_data = [{
@@ -198,93 +235,126 @@ class TestParseForecast:
 class TestReadLocations:
     """Tests for read_locations function."""
 
-    def test_reads_locations_from_file(self):
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            f.write("Sydney\nMelbourne\nBrisbane\n")
-            f.flush()
-            path = f.name
-
-        try:
-            locations = read_locations(path)
-            assert locations == ["Sydney", "Melbourne", "Brisbane"]
-        finally:
-            Path(path).unlink()
-
-    def test_skips_blank_lines(self):
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            f.write("Sydney\n\nMelbourne\n  \nBrisbane\n")
-            f.flush()
-            path = f.name
-
-        try:
-            locations = read_locations(path)
-            assert locations == ["Sydney", "Melbourne", "Brisbane"]
-        finally:
-            Path(path).unlink()
-
-    def test_strips_whitespace(self):
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            f.write("  Sydney  \n  Melbourne\n")
-            f.flush()
-            path = f.name
-
-        try:
-            locations = read_locations(path)
-            assert locations == ["Sydney", "Melbourne"]
-        finally:
-            Path(path).unlink()
+    def test_reads_locations_from_file(self, tmp_path):
+        path = tmp_path / "locations.txt"
+        path.write_text("Sydney\nMelbourne\nBrisbane\n")
+
+        locations = read_locations(str(path))
+        assert locations == ["Sydney", "Melbourne", "Brisbane"]
+
+    def test_skips_blank_lines(self, tmp_path):
+        path = tmp_path / "locations.txt"
+        path.write_text("Sydney\n\nMelbourne\n  \nBrisbane\n")
+
+        locations = read_locations(str(path))
+        assert locations == ["Sydney", "Melbourne", "Brisbane"]
+
+    def test_strips_whitespace(self, tmp_path):
+        path = tmp_path / "locations.txt"
+        path.write_text("  Sydney  \n  Melbourne\n")
+
+        locations = read_locations(str(path))
+        assert locations == ["Sydney", "Melbourne"]
+
+    def test_iter_locations_yields_lazily(self, tmp_path):
+        path = tmp_path / "locations.txt"
+        path.write_text("Sydney\n\n  Melbourne \n")
+
+        locations = iter_locations(str(path))
+        assert next(locations) == "Sydney"
+
+        # Lines added after iteration starts are still read
+        with open(path, "a") as f:
+            f.write("Orange\n")
+
+        assert list(locations) == ["Melbourne", "Orange"]
+
+    def test_iter_locations_opens_file_on_first_next(self, tmp_path):
+        locations = iter_locations(str(tmp_path / "missing.txt"))
+
+        with pytest.raises(FileNotFoundError):
+            next(locations)
+
+
+class TestCsvRow:
+    """Tests for _csv_row function."""
+
+    def test_builds_row_in_header_order(self):
+        forecast = LocationForecast(
+            name="Lithgow",
+            today_min=12,
+            today_max=18,
+            daily_forecasts=tuple(DayForecast(temp_min=i, temp_max=i + 10) for i in range(6)),
+            rain_range_mm="1-30",
+            fire_danger="Moderate",
+        )
+
+        row = _csv_row(forecast)
+
+        assert len(row) == len(CSV_HEADER)
+        assert row[:5] == ["Lithgow", 12, 18, 0, 10]
+        assert row[-4:] == [5, 15, "1-30", "Moderate"]
+
+    def test_pads_missing_days_and_values(self):
+        forecast = LocationForecast(
+            name="Test",
+            today_min=None,
+            today_max=25,
+            daily_forecasts=(DayForecast(temp_min=None, temp_max=20),),
+        )
+
+        row = _csv_row(forecast)
+
+        assert len(row) == len(CSV_HEADER)
+        assert row[:5] == ["Test", "", 25, "", 20]
+        # Days 2-6, rain and fire danger are all empty
+        assert row[5:] == [""] * (len(CSV_HEADER) - 5)
 
 
 class TestWriteCsv:
     """Tests for write_csv function."""
 
-    def test_writes_header_and_data(self):
+    def test_writes_header_and_data(self, tmp_path):
         forecasts = [
             LocationForecast(
                 name="Lithgow",
                 today_min=12,
                 today_max=18,
-                daily_forecasts=[
+                daily_forecasts=(
                     DayForecast(temp_min=12, temp_max=16),
                     DayForecast(temp_min=14, temp_max=22),
-                ],
+                ),
                 rain_range_mm="1-30",
                 fire_danger="Moderate",
             )
         ]
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            path = f.name
+        path = tmp_path / "forecast.csv"
+        count = write_csv(iter(forecasts), path)
+        assert count == 1
 
-        try:
-            count = write_csv(iter(forecasts), path)
-            assert count == 1
+        with open(path) as f:
+            rows = list(csv.reader(f))
 
-            with open(path) as f:
-                reader = csv.reader(f)
-                rows = list(reader)
+        assert len(rows) == 2  # header + 1 data row
 
-            assert len(rows) == 2  # header + 1 data row
+        # Check header structure
+        header = rows[0]
+        assert header[0] == "location"
+        assert header[1] == "today_min"
+        assert header[2] == "today_max"
+        assert "day1_min" in header
+        assert "rain_mm" in header
+        assert "fire_danger" in header
 
-            # Check header structure
-            header = rows[0]
-            assert header[0] == "location"
-            assert header[1] == "today_min"
-            assert header[2] == "today_max"
-            assert "day1_min" in header
-            assert "rain_mm" in header
-            assert "fire_danger" in header
+        # Check data
+        data = rows[1]
+        assert data[0] == "Lithgow"
+        assert data[1] == "12"  # today_min
+        assert data[2] == "18"  # today_max
 
-            # Check data
-            data = rows[1]
-            assert data[0] == "Lithgow"
-            assert data[1] == "12"  # today_min
-            assert data[2] == "18"  # today_max
-
-            # Fire danger should be last
-            assert data[-1] == "Moderate"
-        finally:
-            Path(path).unlink()
+        # Fire danger should be last
+        assert data[-1] == "Moderate"
 
     def test_handles_missing_values(self):
         forecasts = [
@@ -297,22 +367,15 @@ class TestWriteCsv:
             )
         ]
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            path = f.name
-
-        try:
-            write_csv(iter(forecasts), path)
+        buf = StringIO()
+        write_csv(iter(forecasts), buf)
+        buf.seek(0)
+        rows = list(csv.reader(buf))
 
-            with open(path) as f:
-                reader = csv.reader(f)
-                rows = list(reader)
-
-            # Missing values should be empty strings
-            data = rows[1]
-            assert data[1] == ""  # today_min
-            assert data[-1] == ""  # fire_danger
-        finally:
-            Path(path).unlink()
+        # Missing values should be empty strings
+        data = rows[1]
+        assert data[1] == ""  # today_min
+        assert data[-1] == ""  # fire_danger
 
     def test_pads_missing_forecast_days(self):
         """Should have 6 following days even if fewer are provided."""
@@ -321,33 +384,26 @@ class TestWriteCsv:
                 name="Test",
                 today_min=10,
                 today_max=20,
-                daily_forecasts=[
+                daily_forecasts=(
                     DayForecast(temp_min=10, temp_max=20),
-                ],
+                ),
                 rain_range_mm="0-5",
                 fire_danger="Low",
             )
         ]
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            path = f.name
-
-        try:
-            write_csv(iter(forecasts), path)
-
-            with open(path) as f:
-                reader = csv.reader(f)
-                rows = list(reader)
+        buf = StringIO()
+        write_csv(iter(forecasts), buf)
+        buf.seek(0)
+        rows = list(csv.reader(buf))
 
-            # Should have header with all 6 following days
-            header = rows[0]
-            assert "day6_min" in header
-            assert "day6_max" in header
+        # Should have header with all 6 following days
+        header = rows[0]
+        assert "day6_min" in header
+        assert "day6_max" in header
 
-            # Data row should be padded
-            assert len(rows[1]) == len(header)
-        finally:
-            Path(path).unlink()
+        # Data row should be padded
+        assert len(rows[1]) == len(header)
 
     def test_field_order(self):
         """Fields should be: location, today, days 1-6, rain, fire."""
@@ -356,31 +412,24 @@ class TestWriteCsv:
                 name="Test",
                 today_min=10,
                 today_max=20,
-                daily_forecasts=[DayForecast(temp_min=11, temp_max=21)],
+                daily_forecasts=(DayForecast(temp_min=11, temp_max=21),),
                 rain_range_mm="0-5",
                 fire_danger="Moderate",
             )
         ]
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-            path = f.name
+        buf = StringIO()
+        write_csv(iter(forecasts), buf)
+        buf.seek(0)
+        header = next(csv.reader(buf))
 
-        try:
-            write_csv(iter(forecasts), path)
-
-            with open(path) as f:
-                reader = csv.reader(f)
-                header = next(reader)
-
-            # Check order
-            assert header.index("location") == 0
-            assert header.index("today_min") == 1
-            assert header.index("today_max") == 2
-            assert header.index("day1_min") == 3
-            assert header.index("rain_mm") < header.index("fire_danger")
-            assert header.index("fire_danger") == len(header) - 1
-        finally:
-            Path(path).unlink()
+        # Check order
+        assert header.index("location") == 0
+        assert header.index("today_min") == 1
+        assert header.index("today_max") == 2
+        assert header.index("day1_min") == 3
+        assert header.index("rain_mm") < header.index("fire_danger")
+        assert header.index("fire_danger") == len(header) - 1
 
 
 class TestSearchLocation:
@@ -390,7 +439,6 @@ class TestSearchLocation:
         result = search_location("AB")
         assert result is None
 
-    @patch("fetch_bom_api.fetch_json")
     def test_prefers_nsw_exact_match(self, mock_fetch):
         mock_fetch.return_value = SEARCH_RESPONSE_MULTIPLE
         result = search_location("Newbridge")
@@ -400,7 +448,6 @@ class TestSearchLocation:
         assert result["name"] == "Newbridge"
         assert result["state"] == "NSW"
 
-    @patch("fetch_bom_api.fetch_json")
     def test_prefers_nsw_when_no_exact_match(self, mock_fetch):
         mock_fetch.return_value = {
             "data": [
@@ -413,7 +460,33 @@ class TestSearchLocation:
         # Should prefer NSW result
         assert result["state"] == "NSW"
 
-    @patch("fetch_bom_api.fetch_json")
+    def test_prefers_exact_match_outside_nsw_over_partial_nsw_match(self, mock_fetch):
+        mock_fetch.return_value = {
+            "data": [
+                {"name": "Springfield North", "geohash": "def", "state": "NSW"},
+                {"name": "Springfield", "geohash": "abc", "state": "VIC"},
+            ]
+        }
+        result = search_location("Springfield")
+
+        assert result["geohash"] == "abc"
+
+    def test_exact_match_is_case_insensitive(self, mock_fetch):
+        mock_fetch.return_value = SEARCH_RESPONSE_MULTIPLE
+        result = search_location("newbridge")
+
+        assert result["name"] == "Newbridge"
+        assert result["state"] == "NSW"
+
+        # A differently cased exact match still beats a partial NSW match
+        mock_fetch.return_value = {
+            "data": [
+                {"name": "Springfield North", "geohash": "def", "state": "NSW"},
+                {"name": "Springfield", "geohash": "abc", "state": "VIC"},
+            ]
+        }
+        assert search_location("springfield")["geohash"] == "abc"
+
     def test_falls_back_to_first_result_if_no_nsw(self, mock_fetch):
         mock_fetch.return_value = {
             "data": [
@@ -426,7 +499,6 @@ class TestSearchLocation:
         # No NSW results, so should return first
         assert result["geohash"] == "abc"
 
-    @patch("fetch_bom_api.fetch_json")
     def test_returns_none_if_no_results(self, mock_fetch):
         mock_fetch.return_value = {"data": []}
         result = search_location("NonexistentPlace")
@@ -437,7 +509,6 @@ class TestSearchLocation:
 class TestFetchDailyForecast:
     """Tests for fetch_daily_forecast function."""
 
-    @patch("fetch_bom_api.fetch_json")
     def test_returns_forecast_data(self, mock_fetch):
         mock_fetch.return_value = FORECAST_RESPONSE
         result = fetch_daily_forecast("r64c839")
@@ -445,10 +516,196 @@ class TestFetchDailyForecast:
         assert len(result) == 3
         assert result[0]["temp_max"] == 18
 
-    @patch("fetch_bom_api.fetch_json")
     def test_returns_empty_list_on_error(self, mock_fetch):
         import urllib.error
         mock_fetch.side_effect = urllib.error.URLError("Network error")
         result = fetch_daily_forecast("r64c839")
 
         assert result == []
+
+
+class TestFetchForecasts:
+    """Tests for fetch_forecasts function."""
+
+    @patch("fetch_bom_api.fetch_daily_forecast")
+    @patch("fetch_bom_api.search_location")
+    def test_preserves_input_order(self, mock_search, mock_daily):
+        mock_search.side_effect = lambda name: {"name": name, "geohash": name.lower()}
+        mock_daily.return_value = FORECAST_RESPONSE["data"]
+        names = [f"Town{i}" for i in range(40)]
+
+        forecasts = list(fetch_forecasts(names))
+
+        assert [f.name for f in forecasts] == names
+
+    @patch("fetch_bom_api.fetch_daily_forecast")
+    @patch("fetch_bom_api.search_location")
+    def test_runs_with_single_worker(self, mock_search, mock_daily):
+        mock_search.side_effect = lambda name: {"name": name, "geohash": name.lower()}
+        mock_daily.return_value = FORECAST_RESPONSE["data"]
+
+        forecasts = list(fetch_forecasts(["Lithgow", "Orange"], max_workers=1))
+
+        assert [f.name for f in forecasts] == ["Lithgow", "Orange"]
+
+    @patch("fetch_bom_api.fetch_daily_forecast")
+    @patch("fetch_bom_api.search_location")
+    def test_fetches_duplicate_names_once(self, mock_search, mock_daily):
+        mock_search.side_effect = lambda name: {"name": name, "geohash": name.lower()}
+        mock_daily.return_value = FORECAST_RESPONSE["data"]
+
+        forecasts = list(fetch_forecasts(["Dubbo", "Orange", "Dubbo"]))
+
+        assert [f.name for f in forecasts] == ["Dubbo", "Orange", "Dubbo"]
+        assert mock_search.call_count == 2
+        assert mock_daily.call_count == 2
+
+    @patch("fetch_bom_api.fetch_daily_forecast")
+    @patch("fetch_bom_api.search_location")
+    def test_uses_geohash_from_entry_without_search(self, mock_search, mock_daily):
+        mock_daily.return_value = FORECAST_RESPONSE["data"]
+
+        forecasts = list(fetch_forecasts(["Lithgow | r64c839"]))
+
+        assert [f.name for f in forecasts] == ["Lithgow"]
+        mock_search.assert_not_called()
+        mock_daily.assert_called_once_with("r64c839")
+
+    @patch("fetch_bom_api.fetch_daily_forecast")
+    @patch("fetch_bom_api.search_location")
+    def test_skips_locations_not_found(self, mock_search, mock_daily):
+        mock_search.side_effect = lambda name: (
+            None if name == "Nowhere" else {"name": name, "geohash": "abc"}
+        )
+        mock_daily.return_value = FORECAST_RESPONSE["data"]
+
+        forecasts = list(fetch_forecasts(iter(["Lithgow", "Nowhere", "Orange"])))
+
+        assert [f.name for f in forecasts] == ["Lithgow", "Orange"]
+
+
+class TestFetchJson:
+    """Tests for fetch_json function."""
+
+    @staticmethod
+    def _response(status=200, body=b"{}", headers=None):
+        response = MagicMock(status=status, reason="OK")
+        response.read.return_value = body
+        response.getheader.side_effect = (headers or {}).get
+        return response
+
+    @patch("fetch_bom_api._thread_local", new_callable=threading.local)
+    @patch("fetch_bom_api.http.client.HTTPSConnection")
+    def test_reuses_connection_for_same_host(self, mock_conn_cls, _):
+        mock_conn_cls.return_value.getresponse.return_value = self._response(
+            body=json.dumps(dict(SEARCH_RESPONSE)).encode()
+        )
+
+        fetch_json("https://api.example.com/v1/locations?search=Lithgow")
+        result = fetch_json("https://api.example.com/v1/locations/r64c839/forecasts/daily")
+
+        assert result == SEARCH_RESPONSE
+        mock_conn_cls.assert_called_once_with("api.example.com", timeout=30)
+        paths = [c.args[1] for c in mock_conn_cls.return_value.request.call_args_list]
+        assert paths == ["/v1/locations?search=Lithgow", "/v1/locations/r64c839/forecasts/daily"]
+
+    @patch("fetch_bom_api._thread_local", new_callable=threading.local)
+    @patch("fetch_bom_api.http.client.HTTPSConnection")
+    def test_decompresses_gzip_response(self, mock_conn_cls, _):
+        connection = mock_conn_cls.return_value
+        connection.getresponse.return_value = self._response(
+            body=gzip.compress(json.dumps(dict(FORECAST_RESPONSE)).encode()),
+            headers={"Content-Encoding": "gzip"},
+        )
+
+        result = fetch_json("https://api.example.com/v1/x")
+
+        assert result == FORECAST_RESPONSE
+        headers = connection.request.call_args.kwargs["headers"]
+        assert headers["Accept-Encoding"] == "gzip"
+
+    @patch("fetch_bom_api._thread_local", new_callable=threading.local)
+    @patch("fetch_bom_api.http.client.HTTPSConnection")
+    def test_follows_one_redirect(self, mock_conn_cls, _):
+        connection = mock_conn_cls.return_value
+        connection.getresponse.side_effect = [
+            self._response(status=301, headers={"Location": "/v1/y"}),
+            self._response(body=b'{"data": []}'),
+        ]
+
+        assert fetch_json("https://api.example.com/v1/x") == {"data": []}
+        paths = [c.args[1] for c in connection.request.call_args_list]
+        assert paths == ["/v1/x", "/v1/y"]
+
+    @patch("fetch_bom_api._thread_local", new_callable=threading.local)
+    @patch("fetch_bom_api.http.client.HTTPSConnection")
+    def test_retries_once_on_dropped_connection(self, mock_conn_cls, _):
+        connection = mock_conn_cls.return_value
+        connection.getresponse.side_effect = [ConnectionResetError(), self._response()]
+
+        assert fetch_json("https://api.example.com/v1/x") == {}
+        assert connection.request.call_count == 2
+
+    @patch("fetch_bom_api._thread_local", new_callable=threading.local)
+    @patch("fetch_bom_api.http.client.HTTPSConnection")
+    def test_raises_http_error_on_bad_status(self, mock_conn_cls, _):
+        mock_conn_cls.return_value.getresponse.return_value = self._response(status=500)
+
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            fetch_json("https://api.example.com/v1/x")
+
+        assert excinfo.value.code == 500
+
+
+class TestLocationCache:
+    """Tests for the on-disk location cache."""
+
+    def test_missing_file_gives_empty_cache(self, tmp_path):
+        assert load_location_cache(str(tmp_path / "missing.json")) == {}
+
+    def test_round_trips_entries(self, tmp_path):
+        path = str(tmp_path / "cache" / "locations.json")
+        cache = {"lithgow": {**LOCATION_DATA, "cached_at": time.time()}}
+
+        save_location_cache(cache, path)
+
+        assert load_location_cache(path) == cache
+
+    def test_drops_expired_entries(self, tmp_path):
+        path = str(tmp_path / "locations.json")
+        save_location_cache({
+            "lithgow": {**LOCATION_DATA, "cached_at": time.time()},
+            "orange": {"name": "Orange", "geohash": "r65", "cached_at": 0},
+        }, path)
+
+        assert list(load_location_cache(path)) == ["lithgow"]
+
+    def test_wrong_shape_gives_empty_cache(self, tmp_path):
+        path = tmp_path / "locations.json"
+        path.write_text('["lithgow"]')
+
+        assert load_location_cache(str(path)) == {}
+
+    def test_skips_malformed_entries(self, tmp_path):
+        path = tmp_path / "locations.json"
+        entry = {**LOCATION_DATA, "cached_at": time.time()}
+        path.write_text(json.dumps({
+            "lithgow": entry,
+            "orange": "r65",
+            "bathurst": {"name": "Bathurst", "cached_at": "yesterday"},
+        }))
+
+        assert load_location_cache(str(path)) == {"lithgow": entry}
+
+    @patch("fetch_bom_api.fetch_daily_forecast")
+    @patch("fetch_bom_api.search_location")
+    def test_fetch_forecasts_uses_and_fills_cache(self, mock_search, mock_daily):
+        mock_search.return_value = {"name": "Orange", "geohash": "r65", "state": "NSW"}
+        mock_daily.return_value = FORECAST_RESPONSE["data"]
+        cache = {"lithgow": {**LOCATION_DATA, "cached_at": time.time()}}
+
+        forecasts = list(fetch_forecasts(["Lithgow", "Orange"], cache))
+
+        assert [f.name for f in forecasts] == ["Lithgow", "Orange"]
+        mock_search.assert_called_once_with("Orange")
+        assert cache["orange"]["geohash"] == "r65"